@@ -9,650 +9,1235 @@ Created by Panos Mitzias (http://www.pmitzias.com), Efstratios Kontopoulos (http
 Powered by CERTH/MKLab (http://mklab.iti.gr)
 """
 
-from SPARQLWrapper import SPARQLWrapper, JSON
-import re
 import sys
 
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2 has no read-only mapping, so the defaults are plain dictionaries
+    MappingProxyType = dict
+
+
+# Popular endpoints, namespaces and transport options, as read-only mappings. These are shared by all PyLOD objects and are only copied when an object modifies them.
+DEFAULT_ENDPOINTS = MappingProxyType({
+    "DBpedia": "http://dbpedia.org/sparql",
+    "GeoLinkedData": "http://linkedgeodata.org/sparql"
+})
+
+DEFAULT_NAMESPACES = MappingProxyType({
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "prov": "http://www.w3.org/ns/prov#",
+    "foaf": "http://xmlns.com/foaf/0.1/",
+    "xml": "http://www.w3.org/2001/XMLSchema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "db": "http://dbpedia.org/",
+    "dbo": "http://dbpedia.org/ontology/",
+    "dbp": "http://dbpedia.org/property/"
+})
+
+DEFAULT_TRANSPORT_OPTIONS = MappingProxyType({
+    "compression": True,
+    "post_threshold": 2048,
+    "result_format": "json",
+    "detect_capabilities": False,
+    "max_results": 50000
+})
+
+class PartialResults(list):
+    """
+    A list of query results that is known to be incomplete, since retrieving a page of the results failed (see SPARQL.execute_select_paged()).
+    """
+
+
+# Capability profiles of the endpoints queried so far, shared by all PyLOD objects (see SPARQL.get_capabilities())
+ENDPOINT_CAPABILITIES = {}
+
+
+class Endpoints(object):
+    __slots__ = ("_dictionary",)
+
+    def __init__(self, endpoint_dictionary=None):
+        """
+        The Endpoints class constructor.
+        :param endpoint_dictionary: Optional argument for user-defined SPARQL-served LOD endpoints given as a dictionary, where the keys are the endpoint names and the key values are the endpoint URLs.
+        """
+
+        self._dictionary = DEFAULT_ENDPOINTS
+        self.set_endpoints(endpoint_dictionary)
 
-class PyLOD:
-    def __init__(self, endpoint_dictionary=None, namespaces_dictionary=None):
+    @property
+    def dictionary(self):
         """
-        The PyLOD class constructor.
-        :param endpoint_dictionary: Optional argument for user-defined SPARQL-served LOD endpoints given as a dictionary, where the keys are the endpoint names and the values are the endpoint URLs.
-        :param namespaces_dictionary: Optional argument for user-defined namespaces given as a dictionary, where the keys are the namespace prefixes and the key values are the namespace URLs.
+        The dictionary of currently set endpoints. The shared popular endpoints are copied on first access, so that they can be safely modified.
         """
 
-        class Endpoints:
-            def __init__(self, endpoint_dictionary=None):
-                """
-                The Endpoints class constructor.
-                :param endpoint_dictionary: Optional argument for user-defined SPARQL-served LOD endpoints given as a dictionary, where the keys are the endpoint names and the key values are the endpoint URLs.
-                """
+        if self._dictionary is DEFAULT_ENDPOINTS:
+            self._dictionary = dict(DEFAULT_ENDPOINTS)
 
-                self.dictionary = {}
-                self.set_endpoints(endpoint_dictionary)
+        return self._dictionary
 
-            def set_endpoints(self, endpoint_dictionary=None):
-                """
-                Sets the dictionary of endpoints to be queried. If the argument endpoint_dictionary is not provided, a set of popular endpoints (e.g. DBpedia) will be used.
-                :param endpoint_dictionary: A user-defined dictionary of endpoints where the keys are the endpoint names and the key values are the corresponding endpoint URLs.
-                """
+    @dictionary.setter
+    def dictionary(self, endpoint_dictionary):
+        self._dictionary = endpoint_dictionary
 
-                if endpoint_dictionary is None:
-                    # Set popular endpoints
-                    self.dictionary = {
-                        "DBpedia": "http://dbpedia.org/sparql",
-                        "GeoLinkedData": "http://linkedgeodata.org/sparql"
-                    }
+    def set_endpoints(self, endpoint_dictionary=None):
+        """
+        Sets the dictionary of endpoints to be queried. If the argument endpoint_dictionary is not provided, a set of popular endpoints (e.g. DBpedia) will be used.
+        :param endpoint_dictionary: A user-defined dictionary of endpoints where the keys are the endpoint names and the key values are the corresponding endpoint URLs.
+        """
 
-                # If a user-defined endpoint dictionary was given as argument
-                elif isinstance(endpoint_dictionary, dict):
-                    self.dictionary = {}
+        if endpoint_dictionary is None:
+            # Set popular endpoints
+            self._dictionary = DEFAULT_ENDPOINTS
 
-                    # For each given endpoint
-                    for key in endpoint_dictionary:
-                        try:
-                            # If given value is string
-                            if isinstance(endpoint_dictionary[key], str):
-                                self.dictionary[key] = endpoint_dictionary[key]
-                        except Exception as e:
-                            print("PyLOD.Endpoints.set_endpoints() - Error appending provided endpoint to endpoints dictionary")
-                            print(e)
+        # If a user-defined endpoint dictionary was given as argument
+        elif isinstance(endpoint_dictionary, dict):
+            self._dictionary = {}
 
-                else:
-                    self.dictionary = {}
-
-            def get_endpoints(self):
-                """
-                :return: The dictionary of currently set endpoints.
-                """
-
-                return self.dictionary
-
-        class Namespaces:
-            def __init__(self, namespace_dictionary):
-                """
-                The Namespaces class constructor.
-                :param namespace_dictionary: Optional argument for a user-defined dictionary of namespaces where the keys are the desired prefixes and the key values are the corresponding namespace URLs.
-                """
-                self.dictionary = self.set_namespaces(namespace_dictionary)
-
-            def set_namespaces(self, namespace_dictionary=None):
-                """
-                Returns a dictionary of the most popular namespaces (rdf, rdfs, etc.). The argument namespace_dictionary may contain a dictionary of user-defined namespaces.
-                :param namespace_dictionary: A user-defined dictionary of namespaces where the keys are the desired prefixes and the key values are the corresponding namespace URLs
-                :return: A dictionary of namespaces.
-                """
-
-                # Popular namespaces
-                namespaces = {
-                    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-                    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
-                    "prov": "http://www.w3.org/ns/prov#",
-                    "foaf": "http://xmlns.com/foaf/0.1/",
-                    "xml": "http://www.w3.org/2001/XMLSchema#",
-                    "owl": "http://www.w3.org/2002/07/owl#",
-                    "db": "http://dbpedia.org/",
-                    "dbo": "http://dbpedia.org/ontology/",
-                    "dbp": "http://dbpedia.org/property/"
-                }
-
-                # If a user-defined namespace dictionary was given as argument
-                if (namespace_dictionary is not None) and (isinstance(namespace_dictionary, dict)):
-
-                    # For each given namespace prefix
-                    for prefix in namespace_dictionary:
-
-                        try:
-                            namespaces[prefix] = namespace_dictionary[prefix]
-                        except Exception as e:
-                            print("PyLOD.Namespaces.set_namespaces() - Error appending provided namespace to namespace dictionary")
-                            print(e)
-
-                return namespaces
-
-            def get_namespaces(self):
-                """
-                :return: The dictionary of currently set namespaces.
-                """
-                return self.dictionary
-
-            def get_namespaces_string(self):
-                """
-                Concatenates all namespaces in the namespace dictionary into a string, in order to be used in SPARQL queries
-                :return: A string that complies with W3C SPARQL definition of namespaces
-                """
-
-                namespaces_string = ''
-
-                for prefix in self.dictionary:
-                    try:
-                        namespaces_string += "PREFIX %s: <%s>\n" % (prefix, self.dictionary[prefix])
-                    except Exception as e:
-                        print("PyLOD.Namespaces.get_namespaces_string() - Error while generating namespaces string from namespace dictionary")
-                        print(e)
-
-                return namespaces_string
-
-        class SPARQL:
-            def __init__(self, pylod):
-                """
-                The SPARQL class constructor.
-                :param pylod: SPARQL's parent class object (PyLOD object).
-                """
-
-                self.pylod = pylod
-
-            def execute_select(self, endpoint_url, query, limit=None):
-                """
-                Uses the SPARQLWrapper module to execute a SPARQL query against the given endpoint.
-                :param endpoint_url: A URL of the SPARQL-served endpoint to be queried.
-                :param query: The desired SPARQL query.
-                :param limit: Optional argument (integer) to limit query results.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                if (not self.pylod.is_valid_string(endpoint_url)) and (not self.pylod.is_valid_string(query)):
-                    print("PyLOD.SPARQL.execute_select() - Invalid arguments")
-                    return False
+            # For each given endpoint
+            for key in endpoint_dictionary:
+                try:
+                    # If given value is string
+                    if isinstance(endpoint_dictionary[key], str):
+                        self._dictionary[key] = endpoint_dictionary[key]
+                except Exception as e:
+                    print("PyLOD.Endpoints.set_endpoints() - Error appending provided endpoint to endpoints dictionary")
+                    print(e)
 
-                # Connect to ontology
-                sparql = SPARQLWrapper(endpoint_url)
+        else:
+            self._dictionary = {}
 
-                # Add prefixes to query
-                query = self.pylod.namespaces.get_namespaces_string() + query
+    def get_endpoints(self):
+        """
+        :return: The dictionary of currently set endpoints.
+        """
 
-                # Add limit to query
-                if (limit is not None) and (isinstance(limit, int)):
-                    query = query + ' LIMIT ' + str(limit)
+        return self.dictionary
 
-                # Set query
-                try:
-                    sparql.setQuery(query)
-                # In case it is not unicode
-                except TypeError:
-                    sparql.setQuery(unicode(query))
 
-                # Set output to JSON
-                sparql.setReturnFormat(JSON)
+class Namespaces(object):
+    __slots__ = ("_dictionary",)
+
+    def __init__(self, namespace_dictionary):
+        """
+        The Namespaces class constructor.
+        :param namespace_dictionary: Optional argument for a user-defined dictionary of namespaces where the keys are the desired prefixes and the key values are the corresponding namespace URLs.
+        """
+
+        if namespace_dictionary is None:
+            self._dictionary = DEFAULT_NAMESPACES
+        else:
+            self._dictionary = self.set_namespaces(namespace_dictionary)
+
+    @property
+    def dictionary(self):
+        """
+        The dictionary of currently set namespaces. The shared popular namespaces are copied on first access, so that they can be safely modified.
+        """
+
+        if self._dictionary is DEFAULT_NAMESPACES:
+            self._dictionary = dict(DEFAULT_NAMESPACES)
+
+        return self._dictionary
+
+    @dictionary.setter
+    def dictionary(self, namespace_dictionary):
+        self._dictionary = namespace_dictionary
+
+    def set_namespaces(self, namespace_dictionary=None):
+        """
+        Returns a dictionary of the most popular namespaces (rdf, rdfs, etc.). The argument namespace_dictionary may contain a dictionary of user-defined namespaces.
+        :param namespace_dictionary: A user-defined dictionary of namespaces where the keys are the desired prefixes and the key values are the corresponding namespace URLs
+        :return: A dictionary of namespaces.
+        """
+
+        # Popular namespaces
+        namespaces = dict(DEFAULT_NAMESPACES)
+
+        # If a user-defined namespace dictionary was given as argument
+        if (namespace_dictionary is not None) and (isinstance(namespace_dictionary, dict)):
+
+            # For each given namespace prefix
+            for prefix in namespace_dictionary:
 
                 try:
-                    # Execute query and return results
-                    return sparql.query().convert()['results']['bindings']
+                    namespaces[prefix] = namespace_dictionary[prefix]
                 except Exception as e:
-                    # print("PyLOD.SPARQL.execute_select() - Error while executing query to ", endpoint_url)
-                    # print(e)
-                    return False
+                    print("PyLOD.Namespaces.set_namespaces() - Error appending provided namespace to namespace dictionary")
+                    print(e)
 
-            def execute_select_to_all_endpoints(self, query, limit_per_endpoint=None):
-                """
-                Executes the given query against all endpoints in the endpoint dictionary.
-                :param query: The desired SPARQL query.
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: A dictionary with the query results per endpoint.
-                """
+        return namespaces
 
-                if not self.pylod.is_valid_string(query) or (limit_per_endpoint is not None and not isinstance(limit_per_endpoint, int)):
-                    print("PyLOD.SPARQL.execute_select_to_all_endpoints() - Invalid arguments")
-                    return False
+    def get_namespaces(self):
+        """
+        :return: The dictionary of currently set namespaces.
+        """
+        return self.dictionary
 
-                results = {}
+    def get_namespaces_string(self, query=None):
+        """
+        Concatenates all namespaces in the namespace dictionary into a string, in order to be used in SPARQL queries
+        :param query: Optional argument. If provided, only the namespaces whose prefixes appear in the query will be included.
+        :return: A string that complies with W3C SPARQL definition of namespaces
+        """
 
-                # Get the endpoints dictionary
-                endpoints = self.pylod.endpoints.get_endpoints()
+        import re
 
-                # For each endpoint
-                for endpoint_name in endpoints:
+        namespaces_string = ''
 
-                    sys.stdout.write("Querying \033[95m" + str(endpoint_name) + "\033[0m | Endpoint status:")
+        for prefix in self._dictionary:
+            try:
+                # Skip prefixes that the query does not use
+                if query is not None and re.search(r'(?<![\w.-])' + re.escape(prefix) + ':', query) is None:
+                    continue
 
-                    # If endpoint is reachable
-                    if self.pylod.sparql.is_active_endpoint(endpoint_url=endpoints[endpoint_name]):
+                namespaces_string += "PREFIX %s: <%s>\n" % (prefix, self._dictionary[prefix])
+            except Exception as e:
+                print("PyLOD.Namespaces.get_namespaces_string() - Error while generating namespaces string from namespace dictionary")
+                print(e)
 
-                        sys.stdout.write("\033[92m ACTIVE \033[0m")
+        return namespaces_string
 
-                        try:
-                            results[endpoint_name] = self.pylod.sparql.execute_select(
-                                endpoint_url=endpoints[endpoint_name],
-                                query=query,
-                                limit=limit_per_endpoint)
 
-                            if results[endpoint_name]:
-                                sys.stdout.write("| Results:\033[92m RETRIEVED \033[0m \n")
-                            else:
-                                sys.stdout.write("| Results:\033[91m NOT RETRIEVED \033[0m \n")
+class SPARQL(object):
+    __slots__ = ("pylod", "_default_transport_options", "_endpoint_transport_options")
 
-                        except Exception as e:
-                            print("PyLOD.SPARQL.execute_select_to_all_endpoints() - Error while executing query to ", endpoint_name)
-                            print(e)
-                    else:
-                        sys.stdout.write("\033[91m UNREACHABLE \033[0m")
-                        sys.stdout.write("| Results: \033[91m NOT RETRIEVED \033[0m \n")
+    def __init__(self, pylod, transport_options=None):
+        """
+        The SPARQL class constructor.
+        :param pylod: SPARQL's parent class object (PyLOD object).
+        :param transport_options: Optional argument for the default transport options of all endpoints given as a dictionary (see set_transport_options()).
+        """
 
-                        results[endpoint_name] = None
+        self.pylod = pylod
 
-                    sys.stdout.flush()
+        # Transport options applied to every endpoint, unless overridden per endpoint URL
+        self._default_transport_options = DEFAULT_TRANSPORT_OPTIONS
+        self._endpoint_transport_options = {}
 
-                return results
+        if transport_options is not None:
+            self.set_transport_options(transport_options)
 
-            def is_active_endpoint(self, endpoint_url):
-                """
-                Checks if the given endpoint URL corresponds to an active SPARQL-served endpoint.
-                :param endpoint_url: The endpoint URL to check.
-                :return: True if endpoint is active, False if endpoint is not reachable.
-                """
+    def set_transport_options(self, transport_options=None, endpoint_url=None):
+        """
+        Sets the options used to transfer queries and results over HTTP. Options not present in transport_options are left unchanged.
+        :param transport_options: A dictionary with any of the following keys:
+        "compression" (boolean) - If True, gzip/deflate encoded responses are requested and decompressed chunk by chunk as they are read (see read_response()).
+        "post_threshold" (integer or None) - Queries whose URL-encoded length exceeds this number of characters are sent via POST instead of GET. If None, GET is always used.
+        "result_format" (string) - The media type of the results requested from the endpoint. One of "json", "xml", "csv" (untyped, see parse_bindings()) and "tsv", or "auto" for the most compact typed format the endpoint supports (detected with four probe queries: reachability, property paths, TSV and XML, see probe_capabilities()).
+        "detect_capabilities" (boolean) - If True, the endpoint is probed for the SPARQL features it supports before it is first queried (see probe_capabilities()).
+        "max_results" (integer or None) - The maximum number of results retrieved per endpoint when no limit is given, however many pages it takes (see execute_select_paged()). If None, all results are retrieved.
+        :param endpoint_url: Optional argument. If provided, the options will only apply to the given endpoint URL, otherwise they will apply to all endpoints.
+        :return: True if the options were set, False if invalid options were given.
+        """
 
-                # Try to make a selection
-                if not self.execute_select(endpoint_url, 'SELECT ?x WHERE {?x ?y ?z}', limit=1):
-                    return False
-                else:
-                    return True
-
-        class Expose:
-            def __init__(self, pylod):
-                """
-                The Expose class constructor.
-                :param pylod: Expose's parent class object (PyLOD object).
-                """
-
-                self.pylod = pylod
-
-            def classes(self, limit_per_endpoint=None):
-                """
-                Exposes URIs of classes.
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?class AS ?uri)
-                            WHERE {
-                                ?class rdf:type owl:Class .
-                            }
-                          """,
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def sub_classes(self, super_class, limit_per_endpoint=None):
-                """
-                Exposes URIs of entities that are sub classes of the given class.
-                :param super_class: The desired class to expose its sub classes.
-                Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(super_class):
-                    if self.pylod.is_url(super_class):
-                        super_class = "<" + super_class + ">"
+        if transport_options is None:
+            return True
 
-                else:
-                    print("PyLOD.Expose.sub_classes() - Invalid argument")
-                    return False
+        if not isinstance(transport_options, dict):
+            print("PyLOD.SPARQL.set_transport_options() - Invalid arguments")
+            return False
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?subclass AS ?uri)
-                            WHERE {
-                                ?subclass rdfs:subClassOf %s .
-                            }
-                          """ % (super_class,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def super_classes(self, sub_class, limit_per_endpoint=None):
-                """
-                Exposes URIs of entities that are super classes of the given class.
-                :param sub_class: The desired class to expose its super classes.
-                Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-                # Validate given argument
-                if self.pylod.is_valid_string(sub_class):
-                    if self.pylod.is_url(sub_class):
-                        sub_class = "<" + sub_class + ">"
+        # Validate given options
+        for option in transport_options:
+            value = transport_options[option]
 
-                else:
-                    print("PyLOD.Expose.super_classes() - Invalid argument")
-                    return False
+            if option in ("compression", "detect_capabilities"):
+                valid = isinstance(value, bool)
+            elif option in ("post_threshold", "max_results"):
+                valid = value is None or (isinstance(value, int) and not isinstance(value, bool) and value >= (1 if option == "max_results" else 0))
+            elif option == "result_format":
+                valid = value in ("json", "xml", "csv", "tsv", "auto")
+            else:
+                valid = False
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?superclass AS ?uri)
-                            WHERE {
-                                 %s rdfs:subClassOf ?superclass .
-                            }
-                          """ % (sub_class,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def equivalent_classes(self, cls, limit_per_endpoint=None):
-                """
-                Exposes URIs of entities that are equivalent classes of the given class.
-                :param cls: The desired class to expose its equivalent classes.
-                Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(cls):
-                    if self.pylod.is_url(cls):
-                        cls = "<" + cls + ">"
-                else:
-                    print("PyLOD.Expose.equivalent_classes() - Invalid argument")
-                    return False
+            if not valid:
+                print("PyLOD.SPARQL.set_transport_options() - Invalid transport option: " + str(option))
+                return False
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?equivalent_class AS ?uri)
-                            WHERE {
-                                 ?equivalent_class owl:equivalentClass %s .
-                            }
-                          """ % (cls,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def disjoint_classes(self, cls, limit_per_endpoint=None):
-                """
-                Exposes URIs of entities that are disjoint classes of the given class.
-                :param cls: The desired class to expose its disjoint classes.
-                Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(cls):
-                    if self.pylod.is_url(cls):
-                        cls = "<" + cls + ">"
-                else:
-                    print("PyLOD.Expose.disjoint_classes() - Invalid argument")
-                    return False
+        if endpoint_url is None:
+            self._default_transport_options = dict(self._default_transport_options, **transport_options)
+        else:
+            self._endpoint_transport_options.setdefault(endpoint_url, {}).update(transport_options)
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?disjoint_class AS ?uri)
-                            WHERE {
-                                 ?disjoint_class owl:disjointWith %s .
-                            }
-                          """ % (cls,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def sub_properties(self, super_property, limit_per_endpoint=None):
-                """
-                Exposes URIs of properties that are sub properties of the given property.
-                :param super_property: The desired property to expose its sub properties.
-                Should be given either with a known prefix (e.g. "rdfs:label") or with the complete URI (e.g. "https://www.w3.org/2000/01/rdf-schema#label").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(super_property):
-                    if self.pylod.is_url(super_property):
-                        super_property = "<" + super_property + ">"
+        return True
 
-                else:
-                    print("PyLOD.Expose.sub_properties() - Invalid argument")
-                    return False
+    def get_transport_options(self, endpoint_url=None):
+        """
+        :param endpoint_url: Optional argument. If provided, the options in effect for the given endpoint URL will be returned.
+        :return: The dictionary of transport options.
+        """
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?subproperty AS ?uri)
-                            WHERE {
-                                ?subproperty rdfs:subPropertyOf %s .
-                            }
-                          """ % (super_property,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def super_properties(self, sub_property, limit_per_endpoint=None):
-                """
-                Exposes URIs of properties that are super properties of the given property.
-                :param sub_property: The desired property to expose its super properties.
-                Should be given either with a known prefix (e.g. "rdfs:label") or with the complete URI (e.g. "https://www.w3.org/2000/01/rdf-schema#label").
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(sub_property):
-                    if self.pylod.is_url(sub_property):
-                        sub_property = "<" + sub_property + ">"
+        transport_options = dict(self._default_transport_options)
 
-                else:
-                    print("PyLOD.Expose.super_properties() - Invalid argument")
-                    return False
+        if endpoint_url in self._endpoint_transport_options:
+            transport_options.update(self._endpoint_transport_options[endpoint_url])
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?superproperty AS ?uri)
-                            WHERE {
-                                %s rdfs:subPropertyOf ?superproperty .
-                            }
-                          """ % (sub_property,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def subjects(self, predicate, object, limit_per_endpoint=None):
-                """
-                Exposes entities found as subjects with the given predicate and object, within the scope of the tiple pattern Subject-Predicate-Object.
-                :param predicate: The desired predicate (either as a full URI or with a known namespace)
-                :param object: The desired object (either as a full URI or with a known namespace)
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given arguments
-                if self.pylod.is_valid_string(predicate) and self.pylod.is_valid_string(object):
-                    if self.pylod.is_url(predicate):
-                        predicate = "<" + predicate + ">"
-                    if self.pylod.is_url(object):
-                        object = "<" + object + ">"
+        return transport_options
 
-                else:
-                    print("PyLOD.Expose.subjects() - Invalid arguments")
-                    return False
+    def execute_select(self, endpoint_url, query, limit=None, offset=None, result_format=None):
+        """
+        Uses the SPARQLWrapper module to execute a SPARQL query against the given endpoint.
+        The query is transferred according to the transport options of the endpoint (see set_transport_options()).
+        :param endpoint_url: A URL of the SPARQL-served endpoint to be queried.
+        :param query: The desired SPARQL query.
+        :param limit: Optional argument (integer) to limit query results.
+        :param offset: Optional argument (integer) for the number of query results to skip.
+        :param result_format: Optional argument to override the result format of the endpoint's transport options.
+        :return: The query results as a dictionary (JSON format).
+        """
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?subject AS ?uri)
-                            WHERE {
-                                ?subject %s %s .
-                            }
-                          """ % (predicate, object),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def predicates(self, subject, object, limit_per_endpoint=None):
-                """
-                Exposes entities found as predicates with the given subject and object, within the scope of the tiple pattern Subject-Predicate-Object.
-                :param subject: The desired subject (either as a full URI or with a known namespace)
-                :param object: The desired object (either as a full URI or with a known namespace)
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given arguments
-                if self.pylod.is_valid_string(subject) and self.pylod.is_valid_string(object):
-                    if self.pylod.is_url(subject):
-                        subject = "<" + subject + ">"
-                    if self.pylod.is_url(object):
-                        object = "<" + object + ">"
+        if (not self.pylod.is_valid_string(endpoint_url)) and (not self.pylod.is_valid_string(query)):
+            print("PyLOD.SPARQL.execute_select() - Invalid arguments")
+            return False
 
-                else:
-                    print("PyLOD.Expose.predicates() - Invalid arguments")
-                    return False
+        # Imported here, since SPARQLWrapper and its rdflib dependencies are slow to import
+        from SPARQLWrapper import SPARQLWrapper, JSON, XML, CSV, TSV, POST, URLENCODED
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?predicate AS ?uri)
-                            WHERE {
-                                %s ?predicate %s .
-                            }
-                          """ % (subject, object),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def objects(self, subject, predicate, limit_per_endpoint=None):
-                """
-                Exposes entities found as objects with the given subject and predicate, within the scope of the tiple pattern Subject-Predicate-Object.
-                :param subject: The desired subject (either as a full URI or with a known namespace)
-                :param predicate: The desired predicate (either as a full URI or with a known namespace)
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given arguments
-                if self.pylod.is_valid_string(subject) and self.pylod.is_valid_string(predicate):
-                    if self.pylod.is_url(subject):
-                        subject = "<" + subject + ">"
-                    if self.pylod.is_url(predicate):
-                        predicate = "<" + predicate + ">"
+        try:
+            from urllib.parse import urlencode
+        except ImportError:
+            from urllib import urlencode
 
-                else:
-                    print("PyLOD.Expose.objects() - Invalid arguments")
-                    return False
+        transport_options = self.get_transport_options(endpoint_url)
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?object AS ?uri)
-                            WHERE {
-                                %s %s ?object .
-                            }
-                          """ % (subject, predicate),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def triples(self, subject=None, predicate=None, object=None, limit_per_endpoint=None):
-                """
-                Exposes triples with the given subject and/or predicate and/or object, within the scope of the tiple pattern Subject-Predicate-Object.
-                If any of the arguments (subject, predicate, object) is not defined (None), then it will act as a variable in the query.
-                :param subject: Optional argument. If not provided, triples will be returned where the subject is variable.
-                :param predicate: Optional argument. If not provided, triples will be returned where the predicate is variable.
-                :param object: Optional argument. If not provided, triples will be returned where the object is variable.
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-                
-                # Validate arguments and initialize not given arguments
-
-                # Subject argument
-                if subject is None:
-                    subject = "?subject"
-                elif self.pylod.is_valid_string(subject):
-                    if self.pylod.is_url(subject):
-                        subject = "<" + subject + ">"
-                else:
-                    print("PyLOD.Expose.triples() - Invalid subject argument")
-                    return False
+        if result_format is None:
+            result_format = transport_options["result_format"]
+
+        # Pick the most compact typed format that the endpoint supports
+        if result_format == "auto":
+            capabilities = self.get_capabilities(endpoint_url)
+            result_format = "json"
+
+            for supported_format in ("tsv", "json", "xml"):
+                if capabilities and supported_format in (capabilities["result_formats"] or []):
+                    result_format = supported_format
+                    break
+
+        # Connect to ontology
+        sparql = SPARQLWrapper(endpoint_url)
+
+        # Add the prefixes used by the query
+        query = self.pylod.namespaces.get_namespaces_string(query) + query
+
+        # Add limit to query
+        if (limit is not None) and (isinstance(limit, int)):
+            query = query + ' LIMIT ' + str(limit)
+
+        # Add offset to query
+        if (offset is not None) and (isinstance(offset, int)):
+            query = query + ' OFFSET ' + str(offset)
+
+        # Set query
+        try:
+            sparql.setQuery(query)
+        # In case it is not unicode
+        except TypeError:
+            sparql.setQuery(unicode(query))
+
+        # Set output format
+        sparql.setReturnFormat({
+            "json": JSON,
+            "xml": XML,
+            "csv": CSV,
+            "tsv": TSV
+        }[result_format])
+
+        # Send long queries in the request body, to avoid exceeding URL length limits
+        if transport_options["post_threshold"] is not None and len(urlencode({"query": query})) > transport_options["post_threshold"]:
+            sparql.setMethod(POST)
+            sparql.setRequestMethod(URLENCODED)
+
+        # Ask for a compressed response
+        if transport_options["compression"]:
+            sparql.addCustomHttpHeader("Accept-Encoding", "gzip, deflate")
+
+        try:
+            # Execute query and return results
+            content = self.read_response(sparql.query().response)
+            return self.parse_bindings(content, result_format)
+        except Exception as e:
+            # print("PyLOD.SPARQL.execute_select() - Error while executing query to ", endpoint_url)
+            # print(e)
+            return False
 
-                # Predicate argument
-                if predicate is None:
-                    predicate = "?predicate"
-                elif self.pylod.is_valid_string(predicate):
-                    if self.pylod.is_url(predicate):
-                        predicate = "<" + predicate + ">"
+    def read_response(self, response, chunk_size=65536):
+        """
+        Reads the body of an HTTP response, decompressing it chunk by chunk if it is gzip or deflate encoded.
+        The compressed body is never held in memory as a whole, but the decompressed body is, since it is parsed afterwards (see parse_bindings()).
+        :param response: The HTTP response object (as returned by urllib).
+        :param chunk_size: Optional argument (integer) for the number of bytes read at a time.
+        :return: The decoded response body as bytes.
+        """
+
+        import zlib
+
+        content_encoding = (response.info().get("Content-Encoding") or "").strip().lower()
+
+        decompressor = None
+        if content_encoding in ("gzip", "x-gzip"):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        chunks = []
+
+        while True:
+            chunk = response.read(chunk_size)
+            if not chunk:
+                break
+
+            # Servers disagree on whether "deflate" means zlib-wrapped or raw deflate data
+            if content_encoding == "deflate" and decompressor is None:
+                header = bytearray(chunk[:2])
+                if len(header) == 2 and (header[0] & 0x0F) == 8 and ((header[0] << 8) + header[1]) % 31 == 0:
+                    decompressor = zlib.decompressobj(zlib.MAX_WBITS)
                 else:
-                    print("PyLOD.Expose.triples() - Invalid predicate argument")
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+            if decompressor is not None:
+                chunks.append(decompressor.decompress(chunk))
+            else:
+                chunks.append(chunk)
+
+        if decompressor is not None:
+            chunks.append(decompressor.flush())
+
+        return b"".join(chunks)
+
+    def parse_bindings(self, content, result_format="json"):
+        """
+        Converts a SPARQL SELECT response body to a list of bindings, as defined by the W3C SPARQL 1.1 Query Results JSON Format.
+        The CSV format does not encode term types, language tags or datatypes. Its values are returned as "bnode" if they start with "_:", as "uri" if they look like HTTP(S)/FTP URLs and as plain "literal" otherwise, so literals that look like URLs or IRIs with other schemes (e.g. urn:, mailto:) are typed incorrectly.
+        :param content: The response body as bytes.
+        :param result_format: The format of the response body. One of "json", "xml", "csv" and "tsv".
+        :return: A list of dictionaries, where the keys are the query variables and the values are dictionaries with the "type" and "value" of each term.
+        """
+
+        text = content.decode("utf-8")
+
+        if result_format == "json":
+            import json
+            return json.loads(text)["results"]["bindings"]
+
+        if result_format == "xml":
+            from xml.etree import ElementTree
+
+            sparql_ns = "{http://www.w3.org/2005/sparql-results#}"
+            xml_ns = "{http://www.w3.org/XML/1998/namespace}"
+
+            bindings = []
+
+            for result in ElementTree.fromstring(content).iter(sparql_ns + "result"):
+                binding = {}
+
+                for variable in result.findall(sparql_ns + "binding"):
+                    for term in variable:
+                        term_type = term.tag.replace(sparql_ns, "")
+                        binding[variable.get("name")] = {"type": term_type, "value": term.text or ""}
+
+                        if term.get(xml_ns + "lang") is not None:
+                            binding[variable.get("name")]["xml:lang"] = term.get(xml_ns + "lang")
+                        if term.get("datatype") is not None:
+                            binding[variable.get("name")]["datatype"] = term.get("datatype")
+
+                bindings.append(binding)
+
+            return bindings
+
+        if result_format == "csv":
+            import csv
+            import io
+
+            rows = list(csv.reader(io.StringIO(text)))
+            bindings = []
+
+            # CSV results carry no term types, so they are guessed from the values
+            for row in rows[1:]:
+                binding = {}
+
+                for variable, value in zip(rows[0], row):
+                    if value == "":
+                        continue
+                    elif value.startswith("_:"):
+                        binding[variable] = {"type": "bnode", "value": value[2:]}
+                    elif self.pylod.is_url(value):
+                        binding[variable] = {"type": "uri", "value": value}
+                    else:
+                        binding[variable] = {"type": "literal", "value": value}
+
+                bindings.append(binding)
+
+            return bindings
+
+        if result_format == "tsv":
+            # Only "\n" ends a row, since other line breaks (e.g. U+2028) may appear unescaped in literals
+            lines = [line[:-1] if line.endswith("\r") else line for line in text.split("\n")]
+
+            if lines and lines[-1] == "":
+                lines.pop()
+
+            variables = [variable.lstrip("?$") for variable in lines[0].split("\t")]
+            bindings = []
+
+            for line in lines[1:]:
+                binding = {}
+
+                for variable, term in zip(variables, line.split("\t")):
+                    if term != "":
+                        binding[variable] = self.parse_tsv_term(term)
+
+                bindings.append(binding)
+
+            return bindings
+
+        return False
+
+    def parse_tsv_term(self, term):
+        """
+        Converts an RDF term, as encoded in the W3C SPARQL 1.1 Query Results TSV Format, to a dictionary.
+        :param term: The encoded RDF term (e.g. <http://dbpedia.org/ontology/Artist>, "Artist"@en, 42).
+        Unquoted numbers and booleans are given the xsd:integer, xsd:decimal, xsd:double or xsd:boolean datatype, as in the JSON format.
+        :return: A dictionary with the "type" and "value" of the term, and its "xml:lang" or "datatype" if any.
+        """
+
+        import re
+
+        if term.startswith("<") and term.endswith(">"):
+            return {"type": "uri", "value": term[1:-1]}
+
+        if term.startswith("_:"):
+            return {"type": "bnode", "value": term[2:]}
+
+        if term.startswith('"'):
+            match = re.match(r'^"((?:[^"\\]|\\.)*)"(.*)$', term, re.DOTALL)
+
+            if match is None:
+                raise ValueError("Unterminated literal in TSV results: " + term)
+
+            value, suffix = match.group(1), match.group(2)
+
+            # Unescape the literal
+            value = re.sub(r'\\(.)', lambda match: {"t": "\t", "n": "\n", "r": "\r"}.get(match.group(1), match.group(1)), value)
+
+            if suffix.startswith("@"):
+                return {"type": "literal", "value": value, "xml:lang": suffix[1:]}
+            if suffix.startswith("^^<"):
+                return {"type": "literal", "value": value, "datatype": suffix[3:-1]}
+
+            return {"type": "literal", "value": value}
+
+        # Unquoted numeric or boolean literal, typed as in Turtle
+        xsd = "http://www.w3.org/2001/XMLSchema#"
+
+        if term in ("true", "false"):
+            return {"type": "literal", "value": term, "datatype": xsd + "boolean"}
+        if re.match(r'^[+-]?[0-9]+$', term):
+            return {"type": "literal", "value": term, "datatype": xsd + "integer"}
+        if re.match(r'^[+-]?[0-9]*\.[0-9]+$', term):
+            return {"type": "literal", "value": term, "datatype": xsd + "decimal"}
+        if re.match(r'^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)[eE][+-]?[0-9]+$', term):
+            return {"type": "literal", "value": term, "datatype": xsd + "double"}
+
+        return {"type": "literal", "value": term}
+
+    def execute_select_paged(self, endpoint_url, query, limit=None, page_size=None):
+        """
+        Executes the given query against the given endpoint, retrieving the results in consecutive pages (LIMIT/OFFSET) when the endpoint caps the number of results per query.
+        A page that comes back short in a round number (e.g. 10000) is suspected to be capped by the endpoint, which is confirmed if the next page is not empty. A confirmed cap is cached for all PyLOD objects (see get_capabilities()).
+        Pages are then requested with one result more than the cap, so that a cap that was raised is noticed. Pages are requested until one comes back short or the limit is reached.
+        Since the query has no ORDER BY, the endpoint may order the results differently for each page, so pages may overlap or miss results. Duplicate results across pages are removed.
+        :param endpoint_url: A URL of the SPARQL-served endpoint to be queried.
+        :param query: The desired SPARQL query.
+        :param limit: Optional argument (integer) for the maximum number of query results. If None, the "max_results" transport option of the endpoint is used (see set_transport_options()).
+        :param page_size: Optional argument (integer) for a fixed number of query results requested per page, instead of detecting the result cap of the endpoint.
+        :return: The query results as a dictionary (JSON format). If a page other than the first fails, the results retrieved so far as a PartialResults list. False if the first page fails.
+        """
+
+        if (limit is not None and not isinstance(limit, int)) or (page_size is not None and (not isinstance(page_size, int) or page_size < 1)):
+            print("PyLOD.SPARQL.execute_select_paged() - Invalid arguments")
+            return False
+
+        if limit is None:
+            limit = self.get_transport_options(endpoint_url)["max_results"]
+
+        capabilities = self.cached_capabilities(endpoint_url)
+
+        results = []
+        offset = 0
+        seen = None
+        suspected_cap = None
+
+        while limit is None or len(results) < limit:
+            known_cap = capabilities["result_cap"]
+
+            if page_size is not None:
+                requested = page_size
+            elif suspected_cap is not None:
+                requested = suspected_cap
+            elif known_cap is not None:
+                requested = known_cap + 1
+            else:
+                requested = None
+
+            if limit is not None:
+                requested = limit - len(results) if requested is None else min(requested, limit - len(results))
+
+            page = self.execute_select(endpoint_url=endpoint_url, query=query, limit=requested, offset=offset or None)
+
+            if page is False:
+                if offset == 0:
                     return False
 
-                # Object argument
-                if object is None:
-                    object = "?object"
-                elif self.pylod.is_valid_string(object):
-                    if self.pylod.is_url(object):
-                        object = "<" + object + ">"
+                print("PyLOD.SPARQL.execute_select_paged() - Error while retrieving results from %s at offset %d, returning %d partial results" % (endpoint_url, offset, len(results)))
+                return PartialResults(results)
+
+            # Start removing duplicates once more than one page is retrieved
+            if offset > 0:
+                if seen is None:
+                    seen = set(self.binding_key(binding) for binding in results)
+
+                for binding in page:
+                    key = self.binding_key(binding)
+                    if key not in seen:
+                        seen.add(key)
+                        results.append(binding)
+            else:
+                results.extend(page)
+
+            offset += len(page)
+            full_page = requested is not None and len(page) == requested
+
+            if page_size is not None:
+                if not full_page:
+                    break
+
+            # A non-empty page after a suspected cap confirms it
+            elif suspected_cap is not None:
+                if not page:
+                    break
+
+                capabilities["result_cap"] = suspected_cap
+                suspected_cap = None
+
+                if not full_page:
+                    break
+
+            elif known_cap is not None:
+                # The endpoint returns more results than the known cap, so the cap was raised
+                if len(page) > known_cap:
+                    capabilities["result_cap"] = None
+                elif len(page) < known_cap:
+                    break
+
+            # Fewer results than requested, in a round number, suggest that the endpoint caps results
+            elif not full_page:
+                if len(page) >= 1000 and len(page) % 1000 == 0:
+                    suspected_cap = len(page)
                 else:
-                    print("PyLOD.Expose.triples() - Invalid object argument")
-                    return False
+                    break
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT ?subject ?predicate ?object
-                            WHERE {
-                                %s %s %s .
-                            }
-                          """ % (subject, predicate, object),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def instances_of_class(self, cls, include_subclasses=False, limit_per_endpoint=None):
-                """
-                Exposes instances of the given class and (optionally) its subclasses.
-                :param cls: The desired class to be queried for isntances.
-                :param include_subclasses: Optional argument (boolean). If True, instances from cls's subclasses will also be returned.
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(cls):
-                    if self.pylod.is_url(cls):
-                        cls = "<" + cls + ">"
+        return results
 
-                else:
-                    print("PyLOD.Expose.instances_of_class() - Invalid argument")
-                    return False
+    def binding_key(self, binding):
+        """
+        :param binding: A query result, as returned by execute_select().
+        :return: A hashable representation of the query result, used to find duplicate results.
+        """
 
-                # Check if subclasses of cls should be included
-                predicate = "rdf:type"
-                if include_subclasses:
-                    predicate += "*"
-
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT (?instance AS ?uri)
-                            WHERE {
-                                 ?instance %s %s .
-                            }
-                          """ % (predicate, cls,),
-                    limit_per_endpoint=limit_per_endpoint)
-
-            def labels(self, entity, language=None, limit_per_endpoint=None):
-                """
-                Exposes the labels of entities. Optionally, a language tag can be defined.
-                :param entity: The URI of entity to retrieve its labels
-                :param language: Optional language parameter as defined in BCP 47.
-                :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
-                :return: The query results as a dictionary (JSON format).
-                """
-
-                # Validate given argument
-                if self.pylod.is_valid_string(entity):
-                    if self.pylod.is_url(entity):
-                        entity = "<" + entity + ">"
+        return tuple(sorted((variable, tuple(sorted(binding[variable].items()))) for variable in binding))
 
-                else:
-                    print("PyLOD.Expose.labels() - Invalid argument")
-                    return False
+    def execute_select_to_all_endpoints(self, query, limit_per_endpoint=None):
+        """
+        Executes the given query against all endpoints in the endpoint dictionary.
+        If an endpoint caps the number of results per query, the results are retrieved in pages, up to limit_per_endpoint or the "max_results" transport option of the endpoint (see execute_select_paged()).
+        :param query: The desired SPARQL query, or a function that receives the capability profile of an endpoint (see get_capabilities()) and returns the query to be sent to it.
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: A dictionary with the query results per endpoint.
+        """
+
+        if not (self.pylod.is_valid_string(query) or callable(query)) or (limit_per_endpoint is not None and not isinstance(limit_per_endpoint, int)):
+            print("PyLOD.SPARQL.execute_select_to_all_endpoints() - Invalid arguments")
+            return False
 
-                language_filter = ""
+        results = {}
 
-                # Check if a language tag is selected
-                if language is not None and self.pylod.is_valid_string(language):
-                    language_filter = "FILTER (LANG(?label) = '%s')" % (language,)
+        # Get the endpoints dictionary
+        endpoints = self.pylod.endpoints.get_endpoints()
 
-                # Execute query
-                return self.pylod.sparql.execute_select_to_all_endpoints(
-                    query="""
-                            SELECT DISTINCT ?label
-                            WHERE {
-                                 %s rdfs:label ?label .
-                                 %s
-                            }
-                          """ % (entity, language_filter,),
-                    limit_per_endpoint=limit_per_endpoint)
+        # For each endpoint
+        for endpoint_name in endpoints:
+
+            sys.stdout.write("Querying \033[95m" + str(endpoint_name) + "\033[0m | Endpoint status:")
+
+            # A successful probe already shows that the endpoint is reachable
+            if self.needs_probe(endpoints[endpoint_name]):
+                capabilities = self.probe_capabilities(endpoint_url=endpoints[endpoint_name])
+                is_active = capabilities is not False
+            else:
+                capabilities = self.get_capabilities(endpoint_url=endpoints[endpoint_name])
+                is_active = self.pylod.sparql.is_active_endpoint(endpoint_url=endpoints[endpoint_name])
+
+            # If endpoint is reachable
+            if is_active:
+
+                sys.stdout.write("\033[92m ACTIVE \033[0m")
+
+                try:
+                    # Build the query for this endpoint
+                    endpoint_query = query(capabilities) if callable(query) else query
+
+                    results[endpoint_name] = self.pylod.sparql.execute_select_paged(
+                        endpoint_url=endpoints[endpoint_name],
+                        query=endpoint_query,
+                        limit=limit_per_endpoint)
+
+                    if isinstance(results[endpoint_name], PartialResults):
+                        sys.stdout.write("| Results:\033[93m PARTIALLY RETRIEVED \033[0m \n")
+                    elif results[endpoint_name]:
+                        sys.stdout.write("| Results:\033[92m RETRIEVED \033[0m \n")
+                    else:
+                        sys.stdout.write("| Results:\033[91m NOT RETRIEVED \033[0m \n")
+
+                except Exception as e:
+                    print("PyLOD.SPARQL.execute_select_to_all_endpoints() - Error while executing query to ", endpoint_name)
+                    print(e)
+            else:
+                sys.stdout.write("\033[91m UNREACHABLE \033[0m")
+                sys.stdout.write("| Results: \033[91m NOT RETRIEVED \033[0m \n")
+
+                results[endpoint_name] = None
+
+            sys.stdout.flush()
+
+        return results
+
+    def is_active_endpoint(self, endpoint_url):
+        """
+        Checks if the given endpoint URL corresponds to an active SPARQL-served endpoint.
+        :param endpoint_url: The endpoint URL to check.
+        :return: True if endpoint is active, False if endpoint is not reachable.
+        """
+
+        # Try to make a selection
+        if not self.execute_select(endpoint_url, 'SELECT ?x WHERE {?x ?y ?z}', limit=1):
+            return False
+        else:
+            return True
+
+    def cached_capabilities(self, endpoint_url):
+        """
+        :param endpoint_url: The endpoint URL to get its capabilities.
+        :return: The capability profile of the given endpoint, as stored in the cache shared by all PyLOD objects.
+        """
+
+        return ENDPOINT_CAPABILITIES.setdefault(endpoint_url, {
+            "property_paths": None,
+            "result_formats": None,
+            "result_cap": None
+        })
+
+    def needs_probe(self, endpoint_url):
+        """
+        Checks if the given endpoint should be probed before it is queried, i.e. if capability detection or the "auto" result format is enabled for it and the required capabilities are not detected yet.
+        :param endpoint_url: The endpoint URL to check.
+        :return: True if the endpoint should be probed, False if not.
+        """
+
+        transport_options = self.get_transport_options(endpoint_url)
+        capabilities = self.cached_capabilities(endpoint_url)
+
+        if transport_options["result_format"] == "auto" and capabilities["result_formats"] is None:
+            return True
+
+        return transport_options["detect_capabilities"] and capabilities["property_paths"] is None
+
+    def get_capabilities(self, endpoint_url, refresh=False):
+        """
+        Returns the capability profile of the given endpoint, which is cached for all PyLOD objects.
+        The endpoint is probed first if needed (see needs_probe()), or if refresh is True. The result cap is learned from paged queries, without probing (see execute_select_paged()).
+        :param endpoint_url: The endpoint URL to get its capabilities.
+        :param refresh: Optional argument (boolean). If True, the endpoint is probed again.
+        :return: A dictionary with the keys "property_paths" (boolean), "result_formats" (list of supported result formats) and "result_cap" (maximum number of results per query), where capabilities not detected yet are None. False if the endpoint was probed and is not reachable.
+        """
+
+        if refresh or self.needs_probe(endpoint_url):
+            return self.probe_capabilities(endpoint_url)
+
+        capabilities = dict(self.cached_capabilities(endpoint_url))
+
+        # Copy the list, so that the cached profile cannot be modified through the returned one
+        if capabilities["result_formats"] is not None:
+            capabilities["result_formats"] = list(capabilities["result_formats"])
+
+        return capabilities
+
+    def probe_capabilities(self, endpoint_url):
+        """
+        Sends two small queries to the given endpoint, in order to check that it is reachable and whether it supports SPARQL 1.1 property paths.
+        If the "auto" result format is enabled for the endpoint, two more small queries detect which of the TSV and XML result formats it supports.
+        :param endpoint_url: The endpoint URL to probe.
+        :return: The capability profile of the endpoint (see get_capabilities()), or False if the endpoint is not reachable.
+        """
+
+        if not self.pylod.is_valid_string(endpoint_url):
+            print("PyLOD.SPARQL.probe_capabilities() - Invalid argument")
+            return False
+
+        capabilities = self.cached_capabilities(endpoint_url)
+
+        # Reachability
+        bindings = self.execute_select(endpoint_url, 'SELECT ?x WHERE {?x ?y ?z}', limit=1, result_format="json")
+
+        if bindings is False:
+            return False
+
+        # SPARQL 1.1 property paths
+        capabilities["property_paths"] = self.execute_select(
+            endpoint_url, 'SELECT ?x WHERE {<urn:pylod:probe> rdf:type/rdfs:subClassOf* ?x}', limit=1, result_format="json") is not False
+
+        # Typed result formats, other than JSON
+        if self.get_transport_options(endpoint_url)["result_format"] == "auto":
+            result_formats = ["json"]
+
+            for result_format in ("tsv", "xml"):
+                bindings = self.execute_select(endpoint_url, 'SELECT ?x WHERE {?x ?y ?z}', limit=1, result_format=result_format)
+
+                # Endpoints that ignore the requested format return results that do not parse to the queried variable
+                if bindings and all(set(binding) == set(["x"]) for binding in bindings):
+                    result_formats.append(result_format)
+
+            capabilities["result_formats"] = result_formats
+
+        return self.get_capabilities(endpoint_url)
+
+
+class Expose(object):
+    __slots__ = ("pylod",)
+
+    def __init__(self, pylod):
+        """
+        The Expose class constructor.
+        :param pylod: Expose's parent class object (PyLOD object).
+        """
+
+        self.pylod = pylod
+
+    def classes(self, limit_per_endpoint=None):
+        """
+        Exposes URIs of classes.
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?class AS ?uri)
+                    WHERE {
+                        ?class rdf:type owl:Class .
+                    }
+                  """,
+            limit_per_endpoint=limit_per_endpoint)
+
+    def sub_classes(self, super_class, limit_per_endpoint=None):
+        """
+        Exposes URIs of entities that are sub classes of the given class.
+        :param super_class: The desired class to expose its sub classes.
+        Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(super_class):
+            if self.pylod.is_url(super_class):
+                super_class = "<" + super_class + ">"
+
+        else:
+            print("PyLOD.Expose.sub_classes() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?subclass AS ?uri)
+                    WHERE {
+                        ?subclass rdfs:subClassOf %s .
+                    }
+                  """ % (super_class,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def super_classes(self, sub_class, limit_per_endpoint=None):
+        """
+        Exposes URIs of entities that are super classes of the given class.
+        :param sub_class: The desired class to expose its super classes.
+        Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+        # Validate given argument
+        if self.pylod.is_valid_string(sub_class):
+            if self.pylod.is_url(sub_class):
+                sub_class = "<" + sub_class + ">"
+
+        else:
+            print("PyLOD.Expose.super_classes() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?superclass AS ?uri)
+                    WHERE {
+                         %s rdfs:subClassOf ?superclass .
+                    }
+                  """ % (sub_class,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def equivalent_classes(self, cls, limit_per_endpoint=None):
+        """
+        Exposes URIs of entities that are equivalent classes of the given class.
+        :param cls: The desired class to expose its equivalent classes.
+        Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(cls):
+            if self.pylod.is_url(cls):
+                cls = "<" + cls + ">"
+        else:
+            print("PyLOD.Expose.equivalent_classes() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?equivalent_class AS ?uri)
+                    WHERE {
+                         ?equivalent_class owl:equivalentClass %s .
+                    }
+                  """ % (cls,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def disjoint_classes(self, cls, limit_per_endpoint=None):
+        """
+        Exposes URIs of entities that are disjoint classes of the given class.
+        :param cls: The desired class to expose its disjoint classes.
+        Should be given either with a known prefix (e.g. "dbo:Artist") or with the complete URI (e.g. "http://dbpedia.org/ontology/Artist").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(cls):
+            if self.pylod.is_url(cls):
+                cls = "<" + cls + ">"
+        else:
+            print("PyLOD.Expose.disjoint_classes() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?disjoint_class AS ?uri)
+                    WHERE {
+                         ?disjoint_class owl:disjointWith %s .
+                    }
+                  """ % (cls,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def sub_properties(self, super_property, limit_per_endpoint=None):
+        """
+        Exposes URIs of properties that are sub properties of the given property.
+        :param super_property: The desired property to expose its sub properties.
+        Should be given either with a known prefix (e.g. "rdfs:label") or with the complete URI (e.g. "https://www.w3.org/2000/01/rdf-schema#label").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(super_property):
+            if self.pylod.is_url(super_property):
+                super_property = "<" + super_property + ">"
+
+        else:
+            print("PyLOD.Expose.sub_properties() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?subproperty AS ?uri)
+                    WHERE {
+                        ?subproperty rdfs:subPropertyOf %s .
+                    }
+                  """ % (super_property,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def super_properties(self, sub_property, limit_per_endpoint=None):
+        """
+        Exposes URIs of properties that are super properties of the given property.
+        :param sub_property: The desired property to expose its super properties.
+        Should be given either with a known prefix (e.g. "rdfs:label") or with the complete URI (e.g. "https://www.w3.org/2000/01/rdf-schema#label").
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(sub_property):
+            if self.pylod.is_url(sub_property):
+                sub_property = "<" + sub_property + ">"
+
+        else:
+            print("PyLOD.Expose.super_properties() - Invalid argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?superproperty AS ?uri)
+                    WHERE {
+                        %s rdfs:subPropertyOf ?superproperty .
+                    }
+                  """ % (sub_property,),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def subjects(self, predicate, object, limit_per_endpoint=None):
+        """
+        Exposes entities found as subjects with the given predicate and object, within the scope of the tiple pattern Subject-Predicate-Object.
+        :param predicate: The desired predicate (either as a full URI or with a known namespace)
+        :param object: The desired object (either as a full URI or with a known namespace)
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given arguments
+        if self.pylod.is_valid_string(predicate) and self.pylod.is_valid_string(object):
+            if self.pylod.is_url(predicate):
+                predicate = "<" + predicate + ">"
+            if self.pylod.is_url(object):
+                object = "<" + object + ">"
+
+        else:
+            print("PyLOD.Expose.subjects() - Invalid arguments")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?subject AS ?uri)
+                    WHERE {
+                        ?subject %s %s .
+                    }
+                  """ % (predicate, object),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def predicates(self, subject, object, limit_per_endpoint=None):
+        """
+        Exposes entities found as predicates with the given subject and object, within the scope of the tiple pattern Subject-Predicate-Object.
+        :param subject: The desired subject (either as a full URI or with a known namespace)
+        :param object: The desired object (either as a full URI or with a known namespace)
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given arguments
+        if self.pylod.is_valid_string(subject) and self.pylod.is_valid_string(object):
+            if self.pylod.is_url(subject):
+                subject = "<" + subject + ">"
+            if self.pylod.is_url(object):
+                object = "<" + object + ">"
+
+        else:
+            print("PyLOD.Expose.predicates() - Invalid arguments")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?predicate AS ?uri)
+                    WHERE {
+                        %s ?predicate %s .
+                    }
+                  """ % (subject, object),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def objects(self, subject, predicate, limit_per_endpoint=None):
+        """
+        Exposes entities found as objects with the given subject and predicate, within the scope of the tiple pattern Subject-Predicate-Object.
+        :param subject: The desired subject (either as a full URI or with a known namespace)
+        :param predicate: The desired predicate (either as a full URI or with a known namespace)
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given arguments
+        if self.pylod.is_valid_string(subject) and self.pylod.is_valid_string(predicate):
+            if self.pylod.is_url(subject):
+                subject = "<" + subject + ">"
+            if self.pylod.is_url(predicate):
+                predicate = "<" + predicate + ">"
+
+        else:
+            print("PyLOD.Expose.objects() - Invalid arguments")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT (?object AS ?uri)
+                    WHERE {
+                        %s %s ?object .
+                    }
+                  """ % (subject, predicate),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def triples(self, subject=None, predicate=None, object=None, limit_per_endpoint=None):
+        """
+        Exposes triples with the given subject and/or predicate and/or object, within the scope of the tiple pattern Subject-Predicate-Object.
+        If any of the arguments (subject, predicate, object) is not defined (None), then it will act as a variable in the query.
+        :param subject: Optional argument. If not provided, triples will be returned where the subject is variable.
+        :param predicate: Optional argument. If not provided, triples will be returned where the predicate is variable.
+        :param object: Optional argument. If not provided, triples will be returned where the object is variable.
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate arguments and initialize not given arguments
+
+        # Subject argument
+        if subject is None:
+            subject = "?subject"
+        elif self.pylod.is_valid_string(subject):
+            if self.pylod.is_url(subject):
+                subject = "<" + subject + ">"
+        else:
+            print("PyLOD.Expose.triples() - Invalid subject argument")
+            return False
+
+        # Predicate argument
+        if predicate is None:
+            predicate = "?predicate"
+        elif self.pylod.is_valid_string(predicate):
+            if self.pylod.is_url(predicate):
+                predicate = "<" + predicate + ">"
+        else:
+            print("PyLOD.Expose.triples() - Invalid predicate argument")
+            return False
+
+        # Object argument
+        if object is None:
+            object = "?object"
+        elif self.pylod.is_valid_string(object):
+            if self.pylod.is_url(object):
+                object = "<" + object + ">"
+        else:
+            print("PyLOD.Expose.triples() - Invalid object argument")
+            return False
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT ?subject ?predicate ?object
+                    WHERE {
+                        %s %s %s .
+                    }
+                  """ % (subject, predicate, object),
+            limit_per_endpoint=limit_per_endpoint)
+
+    def instances_of_class(self, cls, include_subclasses=False, limit_per_endpoint=None):
+        """
+        Exposes instances of the given class and (optionally) its subclasses.
+        :param cls: The desired class to be queried for isntances.
+        :param include_subclasses: Optional argument (boolean). If True, instances from cls's subclasses will also be returned.
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(cls):
+            if self.pylod.is_url(cls):
+                cls = "<" + cls + ">"
+
+        else:
+            print("PyLOD.Expose.instances_of_class() - Invalid argument")
+            return False
+
+        def query(capabilities):
+            # Check if subclasses of cls should be included
+            if not include_subclasses:
+                pattern = "?instance rdf:type %s ." % (cls,)
+
+            # Follow the whole subclass hierarchy where property paths are supported
+            elif capabilities["property_paths"] is not False:
+                pattern = "?instance rdf:type/rdfs:subClassOf* %s ." % (cls,)
+
+            # Otherwise, only include instances of direct subclasses
+            else:
+                pattern = "{ ?instance rdf:type %s . } UNION { ?instance rdf:type ?subclass . ?subclass rdfs:subClassOf %s . }" % (cls, cls)
+
+            return """
+                    SELECT DISTINCT (?instance AS ?uri)
+                    WHERE {
+                         %s
+                    }
+                  """ % (pattern,)
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query=query,
+            limit_per_endpoint=limit_per_endpoint)
+
+    def labels(self, entity, language=None, limit_per_endpoint=None):
+        """
+        Exposes the labels of entities. Optionally, a language tag can be defined.
+        :param entity: The URI of entity to retrieve its labels
+        :param language: Optional language parameter as defined in BCP 47.
+        :param limit_per_endpoint: Optional argument (integer) to limit query results per endpoint.
+        :return: The query results as a dictionary (JSON format).
+        """
+
+        # Validate given argument
+        if self.pylod.is_valid_string(entity):
+            if self.pylod.is_url(entity):
+                entity = "<" + entity + ">"
+
+        else:
+            print("PyLOD.Expose.labels() - Invalid argument")
+            return False
+
+        language_filter = ""
+
+        # Check if a language tag is selected
+        if language is not None and self.pylod.is_valid_string(language):
+            language_filter = "FILTER (LANG(?label) = '%s')" % (language,)
+
+        # Execute query
+        return self.pylod.sparql.execute_select_to_all_endpoints(
+            query="""
+                    SELECT DISTINCT ?label
+                    WHERE {
+                         %s rdfs:label ?label .
+                         %s
+                    }
+                  """ % (entity, language_filter,),
+            limit_per_endpoint=limit_per_endpoint)
+
+
+class PyLOD(object):
+    def __init__(self, endpoint_dictionary=None, namespaces_dictionary=None, transport_options=None):
+        """
+        The PyLOD class constructor.
+        :param endpoint_dictionary: Optional argument for user-defined SPARQL-served LOD endpoints given as a dictionary, where the keys are the endpoint names and the values are the endpoint URLs.
+        :param namespaces_dictionary: Optional argument for user-defined namespaces given as a dictionary, where the keys are the namespace prefixes and the key values are the namespace URLs.
+        :param transport_options: Optional argument for the default transport options of all endpoints given as a dictionary (see SPARQL.set_transport_options()).
+        """
 
         self.endpoints = Endpoints(endpoint_dictionary=endpoint_dictionary)
         self.namespaces = Namespaces(namespace_dictionary=namespaces_dictionary)
-        self.sparql = SPARQL(pylod=self)
+        self.sparql = SPARQL(pylod=self, transport_options=transport_options)
         self.expose = Expose(pylod=self)
 
     def is_url(self, text):
@@ -662,6 +1247,8 @@ class PyLOD:
         :return: True if URL, False if not a URL.
         """
 
+        import re
+
         regex = re.compile(
                 r'^(?:http|ftp)s?://' # http:// or https://
                 r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|' #domain...
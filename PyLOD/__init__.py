@@ -1,6 +1,6 @@
 try:
-    from PyLOD.PyLOD import PyLOD
+    from PyLOD.PyLOD import PyLOD, PartialResults
 except:
-    from PyLOD import PyLOD
+    from PyLOD import PyLOD, PartialResults
 
 __author__ = 'Panos Mitzias'
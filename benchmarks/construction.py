@@ -0,0 +1,173 @@
+"""
+Compares the cost of importing PyLOD and of creating PyLOD objects against a baseline revision of PyLOD.py.
+
+Usage: python benchmarks/construction.py [--baseline REVISION] [--number NUMBER]
+
+The baseline PyLOD.py is read from git (by default from the root commit, before the PyLOD classes were moved to module level).
+If SPARQLWrapper is not installed, a stub module is used for the baseline, which imports SPARQLWrapper eagerly, so its import time is understated.
+
+Reports, for the baseline and the current tree:
+- The import time in a fresh interpreter (fastest of several runs), and whether PyLOD imports SPARQLWrapper at module level.
+- The average construction time of a PyLOD object, with the default and with user-defined endpoints and namespaces.
+- The average memory allocated per live PyLOD object.
+"""
+
+import argparse
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports a PyLOD module in a fresh interpreter, stubbing SPARQLWrapper if it is not installed
+IMPORT_SCRIPT = """
+import importlib.util
+import sys
+import time
+import types
+sys.path.insert(0, %r)
+if importlib.util.find_spec("SPARQLWrapper") is None:
+    stub = types.ModuleType("SPARQLWrapper")
+    for name in ("SPARQLWrapper", "JSON", "XML", "CSV", "TSV", "POST", "URLENCODED"):
+        setattr(stub, name, name)
+    sys.modules["SPARQLWrapper"] = stub
+start = time.perf_counter()
+import %s
+print(time.perf_counter() - start)
+print("SPARQLWrapper" in vars(sys.modules[%r]) or hasattr(sys.modules[%r], "SPARQLWrapper"))
+"""
+
+
+def checkout_baseline(revision):
+    """
+    Writes the baseline PyLOD.py to a temporary directory, as the module baseline_pylod.
+    :param revision: The git revision to read PyLOD/PyLOD.py from. If None, the root commit is used.
+    :return: The temporary directory.
+    """
+
+    if revision is None:
+        revision = subprocess.check_output(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=REPOSITORY_PATH).decode().split()[0]
+
+    source = subprocess.check_output(["git", "show", revision + ":PyLOD/PyLOD.py"], cwd=REPOSITORY_PATH)
+
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(directory, "baseline_pylod.py"), "wb") as module_file:
+        module_file.write(source)
+
+    return directory
+
+
+def import_time(path, module_name, repeat=5):
+    """
+    Imports a module in fresh interpreters.
+    :param path: The directory to import the module from.
+    :param module_name: The module to import.
+    :param repeat: The number of interpreters to start.
+    :return: The fastest import time in seconds, and whether the module imports SPARQLWrapper at module level.
+    """
+
+    timings = []
+    sparqlwrapper_imported = False
+
+    # Compile beforehand, so that both trees are timed loading cached bytecode
+    for root, _, file_names in os.walk(os.path.join(path, module_name) if os.path.isdir(os.path.join(path, module_name)) else path):
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                py_compile.compile(os.path.join(root, file_name))
+
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT % (path, module_name, module_name, module_name)]).decode().split()
+        timings.append(float(output[0]))
+        sparqlwrapper_imported = sparqlwrapper_imported or output[1] == "True"
+
+    return min(timings), sparqlwrapper_imported
+
+
+def construction_time(factory, number):
+    """
+    :param factory: A function that creates a PyLOD object.
+    :param number: The number of objects to create.
+    :return: The average construction time in seconds.
+    """
+
+    return timeit.timeit(factory, number=number) / number
+
+
+def memory_per_object(pylod_class, number=1000):
+    """
+    :param pylod_class: The PyLOD class to instantiate.
+    :param number: The number of PyLOD objects to keep alive.
+    :return: The average number of bytes allocated per object.
+    """
+
+    tracemalloc.start()
+    objects = [pylod_class() for _ in range(number)]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return allocated / float(len(objects))
+
+
+def load_pylod_classes(baseline_directory):
+    """
+    :param baseline_directory: The directory of the baseline_pylod module.
+    :return: The baseline and current PyLOD classes.
+    """
+
+    import types
+
+    # The baseline imports SPARQLWrapper at module level
+    try:
+        import SPARQLWrapper
+    except ImportError:
+        stub = types.ModuleType("SPARQLWrapper")
+        for name in ("SPARQLWrapper", "JSON", "XML", "CSV", "TSV", "POST", "URLENCODED"):
+            setattr(stub, name, name)
+        sys.modules["SPARQLWrapper"] = stub
+
+    sys.path.insert(0, baseline_directory)
+    sys.path.insert(0, REPOSITORY_PATH)
+
+    import baseline_pylod
+    from PyLOD import PyLOD
+
+    return baseline_pylod.PyLOD, PyLOD
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares PyLOD import and construction cost against a baseline revision.")
+    parser.add_argument("--baseline", default=None, help="Git revision of the baseline PyLOD.py (default: the root commit)")
+    parser.add_argument("--number", type=int, default=20000, help="Number of objects created per construction timing")
+    arguments = parser.parse_args()
+
+    baseline_directory = checkout_baseline(arguments.baseline)
+
+    try:
+        baseline_import, baseline_sparqlwrapper = import_time(baseline_directory, "baseline_pylod")
+        current_import, current_sparqlwrapper = import_time(REPOSITORY_PATH, "PyLOD")
+
+        BaselinePyLOD, PyLOD = load_pylod_classes(baseline_directory)
+
+        rows = [
+            ("import PyLOD (ms)", baseline_import * 1000, current_import * 1000),
+            ("PyLOD() (us)",
+             construction_time(BaselinePyLOD, arguments.number) * 1e6,
+             construction_time(PyLOD, arguments.number) * 1e6),
+            ("PyLOD(endpoints, namespaces) (us)",
+             construction_time(lambda: BaselinePyLOD({"DBpedia": "http://dbpedia.org/sparql"}, {"ex": "http://example.org/"}), arguments.number) * 1e6,
+             construction_time(lambda: PyLOD({"DBpedia": "http://dbpedia.org/sparql"}, {"ex": "http://example.org/"}), arguments.number) * 1e6),
+            ("Memory per PyLOD object (bytes)", memory_per_object(BaselinePyLOD), memory_per_object(PyLOD)),
+        ]
+
+        print("%-36s %12s %12s %9s" % ("", "baseline", "current", "speedup"))
+        for name, baseline, current in rows:
+            print("%-36s %12.2f %12.2f %8.1fx" % (name, baseline, current, baseline / current))
+
+        print("SPARQLWrapper imported at module level: baseline %s, current %s" % (baseline_sparqlwrapper, current_sparqlwrapper))
+    finally:
+        shutil.rmtree(baseline_directory)
@@ -0,0 +1,344 @@
+"""
+Offline tests for PyLOD. SPARQLWrapper is replaced by a stub that serves canned responses, so no endpoint is contacted.
+"""
+
+import gzip
+import io
+import json
+import re
+import sys
+import types
+import unittest
+import zlib
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from PyLOD import PyLOD
+
+pylod_module = sys.modules["PyLOD.PyLOD"]
+
+
+class StubResponse(object):
+    def __init__(self, body, content_encoding=None):
+        self.body = io.BytesIO(body)
+        self.content_encoding = content_encoding
+
+    def info(self):
+        return {"Content-Encoding": self.content_encoding} if self.content_encoding else {}
+
+    def read(self, size):
+        return self.body.read(size)
+
+
+class StubEndpoint(object):
+    """
+    A SPARQL endpoint serving the URIs http://example.org/0 ... http://example.org/<size - 1> as JSON results, at most cap at a time.
+    """
+
+    def __init__(self, size, cap=None, fail_at_offset=None):
+        self.size = size
+        self.cap = cap
+        self.fail_at_offset = fail_at_offset
+        self.requests = []
+
+    def module(self):
+        endpoint = self
+
+        class SPARQLWrapper(object):
+            def __init__(self, endpoint_url):
+                self.method = "GET"
+
+            def setQuery(self, query):
+                self.query_text = query
+
+            def setReturnFormat(self, return_format):
+                pass
+
+            def setMethod(self, method):
+                self.method = method
+
+            def setRequestMethod(self, request_method):
+                pass
+
+            def addCustomHttpHeader(self, header, value):
+                pass
+
+            def query(self):
+                return types.SimpleNamespace(response=StubResponse(endpoint.respond(self.query_text, self.method)))
+
+        module = types.ModuleType("SPARQLWrapper")
+        module.SPARQLWrapper = SPARQLWrapper
+        for name in ("JSON", "XML", "CSV", "TSV", "POST", "URLENCODED"):
+            setattr(module, name, name.lower())
+
+        return module
+
+    def respond(self, query, method):
+        limit = re.search(r"LIMIT (\d+)", query)
+        offset = re.search(r"OFFSET (\d+)", query)
+        limit = int(limit.group(1)) if limit else None
+        offset = int(offset.group(1)) if offset else 0
+
+        self.requests.append((method, limit, offset))
+
+        if self.fail_at_offset is not None and offset >= self.fail_at_offset:
+            raise IOError("Endpoint error")
+
+        count = self.size - offset
+        for bound in (limit, self.cap):
+            if bound is not None:
+                count = min(count, bound)
+
+        bindings = [{"uri": {"type": "uri", "value": "http://example.org/%d" % (offset + i,)}} for i in range(max(count, 0))]
+        return json.dumps({"results": {"bindings": bindings}}).encode("utf-8")
+
+    def __enter__(self):
+        self.patch = mock.patch.dict(sys.modules, {"SPARQLWrapper": self.module()})
+        self.patch.start()
+        pylod_module.ENDPOINT_CAPABILITIES.clear()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.patch.stop()
+        pylod_module.ENDPOINT_CAPABILITIES.clear()
+
+
+class TestDefaults(unittest.TestCase):
+    def test_defaults_are_read_only(self):
+        for defaults in (pylod_module.DEFAULT_ENDPOINTS, pylod_module.DEFAULT_NAMESPACES, pylod_module.DEFAULT_TRANSPORT_OPTIONS):
+            with self.assertRaises(TypeError):
+                defaults["key"] = "value"
+
+    def test_defaults_are_copied_on_write(self):
+        first, second = PyLOD(), PyLOD()
+
+        first.namespaces.get_namespaces()["ex"] = "http://example.org/"
+        first.endpoints.get_endpoints()["Example"] = "http://example.org/sparql"
+        first.sparql.set_transport_options({"compression": False})
+
+        self.assertNotIn("ex", second.namespaces.get_namespaces())
+        self.assertNotIn("Example", second.endpoints.get_endpoints())
+        self.assertTrue(second.sparql.get_transport_options()["compression"])
+        self.assertIn("PREFIX ex: <http://example.org/>", first.namespaces.get_namespaces_string("SELECT ?x WHERE {?x a ex:Thing}"))
+
+
+class TestParseBindings(unittest.TestCase):
+    def setUp(self):
+        self.sparql = PyLOD().sparql
+
+    def test_json(self):
+        content = b'{"head": {"vars": ["x"]}, "results": {"bindings": [{"x": {"type": "uri", "value": "http://example.org/"}}]}}'
+        self.assertEqual(self.sparql.parse_bindings(content, "json"), [{"x": {"type": "uri", "value": "http://example.org/"}}])
+
+    def test_xml(self):
+        content = b'''<?xml version="1.0"?>
+            <sparql xmlns="http://www.w3.org/2005/sparql-results#">
+                <head><variable name="x"/><variable name="y"/></head>
+                <results>
+                    <result>
+                        <binding name="x"><literal xml:lang="en">Artist</literal></binding>
+                        <binding name="y"><literal datatype="http://www.w3.org/2001/XMLSchema#integer">42</literal></binding>
+                    </result>
+                    <result><binding name="x"><bnode>b0</bnode></binding></result>
+                </results>
+            </sparql>'''
+
+        self.assertEqual(self.sparql.parse_bindings(content, "xml"), [
+            {"x": {"type": "literal", "value": "Artist", "xml:lang": "en"},
+             "y": {"type": "literal", "value": "42", "datatype": "http://www.w3.org/2001/XMLSchema#integer"}},
+            {"x": {"type": "bnode", "value": "b0"}}
+        ])
+
+    def test_csv(self):
+        content = b'x,y\r\nhttp://example.org/,"a, b"\r\n_:b0,\r\n'
+
+        self.assertEqual(self.sparql.parse_bindings(content, "csv"), [
+            {"x": {"type": "uri", "value": "http://example.org/"}, "y": {"type": "literal", "value": "a, b"}},
+            {"x": {"type": "bnode", "value": "b0"}}
+        ])
+
+    def test_tsv(self):
+        content = b'?x\t?y\n<http://example.org/>\t"Artist"@en\n_:b0\t\n'
+
+        self.assertEqual(self.sparql.parse_bindings(content, "tsv"), [
+            {"x": {"type": "uri", "value": "http://example.org/"}, "y": {"type": "literal", "value": "Artist", "xml:lang": "en"}},
+            {"x": {"type": "bnode", "value": "b0"}}
+        ])
+
+    def test_tsv_unescaped_line_breaks_in_literals(self):
+        content = u'?x\r\n"d\u0085e"\r\n"f g\x0bh"\r\n'.encode("utf-8")
+
+        self.assertEqual(self.sparql.parse_bindings(content, "tsv"), [
+            {"x": {"type": "literal", "value": u"d\u0085e"}},
+            {"x": {"type": "literal", "value": u"f g\x0bh"}}
+        ])
+
+    def test_tsv_unbound_single_variable(self):
+        self.assertEqual(self.sparql.parse_bindings(b'?x\n\n<http://example.org/>\n', "tsv"), [
+            {},
+            {"x": {"type": "uri", "value": "http://example.org/"}}
+        ])
+
+
+class TestParseTsvTerm(unittest.TestCase):
+    def setUp(self):
+        self.sparql = PyLOD().sparql
+
+    def test_uri_and_bnode(self):
+        self.assertEqual(self.sparql.parse_tsv_term("<http://example.org/>"), {"type": "uri", "value": "http://example.org/"})
+        self.assertEqual(self.sparql.parse_tsv_term("_:b0"), {"type": "bnode", "value": "b0"})
+
+    def test_literals(self):
+        self.assertEqual(self.sparql.parse_tsv_term('"a\\tb\\"c"'), {"type": "literal", "value": 'a\tb"c'})
+        self.assertEqual(self.sparql.parse_tsv_term('"1"^^<http://www.w3.org/2001/XMLSchema#int>'),
+                         {"type": "literal", "value": "1", "datatype": "http://www.w3.org/2001/XMLSchema#int"})
+
+    def test_unquoted_literals(self):
+        xsd = "http://www.w3.org/2001/XMLSchema#"
+
+        for term, datatype in (("42", "integer"), ("-1.5", "decimal"), ("1e3", "double"), (".5E-2", "double"), ("true", "boolean")):
+            self.assertEqual(self.sparql.parse_tsv_term(term), {"type": "literal", "value": term, "datatype": xsd + datatype})
+
+    def test_unterminated_literal(self):
+        for term in ('"abc', '"abc\\"', '"'):
+            self.assertRaises(ValueError, self.sparql.parse_tsv_term, term)
+
+
+class TestReadResponse(unittest.TestCase):
+    body = json.dumps({"results": {"bindings": [{"x": {"type": "uri", "value": "http://example.org/"}}] * 1000}}).encode("utf-8")
+
+    def read(self, content, content_encoding):
+        return PyLOD().sparql.read_response(StubResponse(content, content_encoding), chunk_size=100)
+
+    def test_identity(self):
+        self.assertEqual(self.read(self.body, None), self.body)
+
+    def test_gzip(self):
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as compressed:
+            compressed.write(self.body)
+
+        self.assertEqual(self.read(buffer.getvalue(), "gzip"), self.body)
+
+    def test_zlib_deflate(self):
+        self.assertEqual(self.read(zlib.compress(self.body), "deflate"), self.body)
+
+    def test_raw_deflate(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.assertEqual(self.read(compressor.compress(self.body) + compressor.flush(), "deflate"), self.body)
+
+
+class TestPostThreshold(unittest.TestCase):
+    def test_short_query_uses_get(self):
+        with StubEndpoint(size=1) as endpoint:
+            PyLOD().sparql.execute_select("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+        self.assertEqual(endpoint.requests[0][0], "GET")
+
+    def test_encoded_length_is_compared(self):
+        # Shorter than the threshold, but longer once URL-encoded
+        query = "SELECT ?uri WHERE {\n ?uri ?p ?o .\n}\n" * 50
+        self.assertLess(len(query), 2048)
+
+        with StubEndpoint(size=1) as endpoint:
+            PyLOD().sparql.execute_select("http://example.org/sparql", query)
+
+        self.assertEqual(endpoint.requests[0][0], "post")
+
+    def test_no_threshold_always_uses_get(self):
+        with StubEndpoint(size=1) as endpoint:
+            PyLOD(transport_options={"post_threshold": None}).sparql.execute_select("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}" * 500)
+
+        self.assertEqual(endpoint.requests[0][0], "GET")
+
+
+class TestExecuteSelectPaged(unittest.TestCase):
+    def test_pages_past_result_cap(self):
+        with StubEndpoint(size=25000, cap=10000) as endpoint:
+            results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}", limit=22000)
+
+        self.assertEqual(len(results), 22000)
+        self.assertEqual(len(set(PyLOD().sparql.binding_key(binding) for binding in results)), 22000)
+
+    def test_default_results_are_bounded(self):
+        with StubEndpoint(size=500000, cap=10000) as endpoint:
+            pylod = PyLOD({"Example": "http://example.org/sparql"})
+            with mock.patch.object(sys, "stdout", io.StringIO()):
+                results = pylod.expose.triples()
+
+        # One reachability check, the first page, the page confirming the cap and three more pages
+        self.assertEqual(len(results["Example"]), 50000)
+        self.assertEqual(len(endpoint.requests), 6)
+
+    def test_max_results_option(self):
+        with StubEndpoint(size=500000, cap=10000) as endpoint:
+            pylod = PyLOD(transport_options={"max_results": 15000})
+            results = pylod.sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+        self.assertEqual(len(results), 15000)
+        self.assertEqual(len(endpoint.requests), 2)
+
+    def test_round_dataset_size_is_not_a_cap(self):
+        with StubEndpoint(size=3000) as endpoint:
+            results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+            self.assertEqual(len(results), 3000)
+            self.assertIsNone(PyLOD().sparql.get_capabilities("http://example.org/sparql")["result_cap"])
+
+            endpoint.size = 9500
+            del endpoint.requests[:]
+            results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+        self.assertEqual(len(results), 9500)
+        self.assertEqual(len(endpoint.requests), 1)
+
+    def test_raised_cap_is_noticed(self):
+        with StubEndpoint(size=25000, cap=10000):
+            pylod_module.ENDPOINT_CAPABILITIES["http://example.org/sparql"] = {"property_paths": None, "result_formats": None, "result_cap": 3000}
+
+            results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+            self.assertEqual(len(results), 25000)
+            self.assertEqual(PyLOD().sparql.get_capabilities("http://example.org/sparql")["result_cap"], 10000)
+
+    def test_failed_page_returns_partial_results(self):
+        with StubEndpoint(size=50000, cap=10000, fail_at_offset=20000):
+            with mock.patch.object(sys, "stdout", io.StringIO()) as stdout:
+                results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}")
+
+        self.assertIsInstance(results, pylod_module.PartialResults)
+        self.assertEqual(len(results), 20000)
+        self.assertIn("PyLOD.SPARQL.execute_select_paged() - Error", stdout.getvalue())
+
+    def test_failed_first_page(self):
+        with StubEndpoint(size=50000, fail_at_offset=0):
+            self.assertIs(PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}"), False)
+
+    def test_fixed_page_size(self):
+        with StubEndpoint(size=2500) as endpoint:
+            results = PyLOD().sparql.execute_select_paged("http://example.org/sparql", "SELECT ?uri WHERE {?uri ?p ?o}", page_size=1000)
+
+        self.assertEqual(len(results), 2500)
+        self.assertEqual([request[1:] for request in endpoint.requests], [(1000, 0), (1000, 1000), (1000, 2000)])
+
+    def test_returned_capabilities_are_copies(self):
+        with StubEndpoint(size=1):
+            sparql = PyLOD().sparql
+            sparql.get_capabilities("http://example.org/sparql")["result_cap"] = 5
+
+            self.assertIsNone(sparql.get_capabilities("http://example.org/sparql")["result_cap"])
+
+    def test_binding_key(self):
+        sparql = PyLOD().sparql
+        first = {"x": {"type": "uri", "value": "http://example.org/"}, "y": {"type": "literal", "value": "a", "xml:lang": "en"}}
+        second = {"y": {"xml:lang": "en", "value": "a", "type": "literal"}, "x": {"value": "http://example.org/", "type": "uri"}}
+
+        self.assertEqual(sparql.binding_key(first), sparql.binding_key(second))
+        self.assertNotEqual(sparql.binding_key(first), sparql.binding_key({"x": first["x"]}))
+
+
+if __name__ == '__main__':
+    unittest.main()